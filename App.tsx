@@ -1,4 +1,4 @@
-import React, { useState, useCallback, useRef, useEffect } from 'react';
+import React, { useState, useCallback, useRef, useEffect, useMemo } from 'react';
 import { v4 as uuidv4 } from 'uuid';
 import { cognitiveParseScreenImage, updateTasksWithChronographer, generateContextualSuggestions } from './services/geminiService';
 import { MonitoringControls } from './components/MonitoringControls';
@@ -23,6 +23,90 @@ const POTENTIAL_MAIN_TASKS_STORAGE_KEY = 'contextualWeaverPotentialMainTasks_v2'
 
 const APP_COMPONENT_NAME = "App";
 
+const readBlobAsDataUrl = (blob: Blob): Promise<string> => new Promise((resolve, reject) => {
+  const reader = new FileReader();
+  reader.onload = () => resolve(reader.result as string);
+  reader.onerror = () => reject(reader.error || new Error("Failed to read captured frame."));
+  reader.readAsDataURL(blob);
+});
+
+const VIDEO_READY_TIMEOUT_MS = 1000;
+const VIDEO_READY_EVENTS = ['loadeddata', 'canplay', 'resize'] as const;
+
+// Resolves once the video reports a frame or its dimensions, or after timeoutMs
+const waitForVideoFrame = (video: HTMLVideoElement, timeoutMs: number): Promise<void> => new Promise(resolve => {
+  const finish = () => {
+    clearTimeout(timeoutId);
+    VIDEO_READY_EVENTS.forEach(eventName => video.removeEventListener(eventName, finish));
+    resolve();
+  };
+  const timeoutId = setTimeout(finish, timeoutMs);
+  VIDEO_READY_EVENTS.forEach(eventName => video.addEventListener(eventName, finish));
+});
+
+// Where common LLM APIs put the generated text, tried in order; the first non-empty match is the task payload.
+const EXTERNAL_LLM_PAYLOAD_EXTRACTORS: Array<(responseData: any) => any> = [
+  (data) => typeof data.text === 'string' ? data.text : undefined, // Simple text response
+  (data) => Array.isArray(data.choices) ? data.choices[0]?.message?.content : undefined, // OpenAI like
+  (data) => Array.isArray(data.candidates) ? data.candidates[0]?.content?.parts?.[0]?.text : undefined, // Gemini like
+  (data) => Array.isArray(data) ? data : undefined, // Direct array response
+];
+
+const extractExternalLLMPayload = (responseData: any): any => {
+  for (const extract of EXTERNAL_LLM_PAYLOAD_EXTRACTORS) {
+    const payload = extract(responseData);
+    if (payload) return payload;
+  }
+  return undefined;
+};
+
+const EXPORT_URL_REVOKE_DELAY_MS = 40 * 1000;
+
+const PERSIST_DEBOUNCE_MS = 500;
+
+// Runs a task when the browser is idle, with a deadline; falls back to setTimeout (Safari has no requestIdleCallback)
+const PERSIST_IDLE_TIMEOUT_MS = 2000;
+const scheduleIdleTask: (task: () => void) => () => void = typeof window.requestIdleCallback === 'function'
+  ? (task) => { const handle = window.requestIdleCallback(task, { timeout: PERSIST_IDLE_TIMEOUT_MS }); return () => window.cancelIdleCallback(handle); }
+  : (task) => { const handle = setTimeout(task, 0); return () => clearTimeout(handle); };
+
+// JSON has no Set type: context id Sets on DCM items and PMTs are written as arrays and rebuilt on load/import.
+// Anything else in that slot (older saves wrote `{}`) becomes an empty Set.
+const jsonReplacer = (_key: string, value: unknown): unknown => value instanceof Set ? Array.from(value) : value;
+const serializeWithSets = (value: unknown): string => JSON.stringify(value, jsonReplacer);
+const serializeMapEntries = (map: Map<string, unknown>): string => serializeWithSets(Array.from(map.entries()));
+const toContextIdSet = (value: unknown): Set<string> => new Set(Array.isArray(value) ? value : []);
+
+const reviveDynamicContextMemory = (entries: Array<[string, DynamicContextItem]>): DynamicContextMemory =>
+  new Map(entries.map(([keyword, item]): [string, DynamicContextItem] => [keyword, { ...item, sourceContextIds: toContextIdSet(item.sourceContextIds) }]));
+
+const revivePotentialMainTasks = (pmts: PotentialMainTask[]): PotentialMainTask[] =>
+  pmts.map(pmt => ({ ...pmt, contributingContextIds: toContextIdSet(pmt.contributingContextIds) }));
+
+// Debounced localStorage write, run at idle time; pending writes are flushed on pagehide and unmount
+function useDebouncedPersistence<T>(storageKey: string, value: T, serialize: (value: T) => string, label: string) {
+  const pendingWriteRef = useRef<(() => void) | null>(null);
+
+  useEffect(() => {
+    const write = () => {
+      if (pendingWriteRef.current !== write) return; // Already flushed
+      pendingWriteRef.current = null;
+      try { localStorage.setItem(storageKey, serialize(value)); }
+      catch (e) { logger.error(APP_COMPONENT_NAME, "useDebouncedPersistence", `Failed to save ${label}`, e); }
+    };
+    pendingWriteRef.current = write;
+    let cancelIdleWrite: (() => void) | null = null;
+    const timeoutId = setTimeout(() => { cancelIdleWrite = scheduleIdleTask(write); }, PERSIST_DEBOUNCE_MS);
+    return () => { clearTimeout(timeoutId); cancelIdleWrite?.(); };
+  }, [storageKey, value, serialize, label]);
+
+  useEffect(() => {
+    const flush = () => pendingWriteRef.current?.();
+    window.addEventListener('pagehide', flush);
+    return () => { window.removeEventListener('pagehide', flush); flush(); };
+  }, []);
+}
+
 const App: React.FC = () => {
   const [captureMode, setCaptureMode] = useState<CaptureMode>('screen');
   const [isMonitoring, setIsMonitoring] = useState<boolean>(false);
@@ -79,15 +163,21 @@ const App: React.FC = () => {
   const videoRef = useRef<HTMLVideoElement | null>(null);
   const mediaStreamRef = useRef<MediaStream | null>(null);
   const captureIntervalIdRef = useRef<number | null>(null);
+  const captureCanvasRef = useRef<HTMLCanvasElement | null>(null); // Reused for every frame grab
   
   const isProcessingAnyRef = useRef(isProcessing || isCapturingFrame || isGeneratingSuggestions || isPlanningProject);
   useEffect(() => { 
     isProcessingAnyRef.current = isProcessing || isCapturingFrame || isGeneratingSuggestions || isPlanningProject; 
   }, [isProcessing, isCapturingFrame, isGeneratingSuggestions, isPlanningProject]);
 
+  useEffect(() => { logger.setDebugEnabled(settings.showDebugInfo); }, [settings.showDebugInfo]);
+
   const isMonitoringRef = useRef(isMonitoring);
   useEffect(() => { isMonitoringRef.current = isMonitoring; }, [isMonitoring]);
 
+  // Revoke the previous preview URL when it is replaced or on unmount
+  useEffect(() => () => { if (latestPreview) URL.revokeObjectURL(latestPreview); }, [latestPreview]);
+
   useEffect(() => {
     fetchHarmoniaDigitalisDocument().then(content => {
       if (content) {
@@ -107,10 +197,10 @@ const App: React.FC = () => {
       if (storedContexts) setAllContexts(new Map(JSON.parse(storedContexts) as [string, CognitiveParserOutput][]));
       
       const storedDynamicContext = localStorage.getItem(DYNAMIC_CONTEXT_MEMORY_STORAGE_KEY);
-      if (storedDynamicContext) setDynamicContextMemory(new Map(JSON.parse(storedDynamicContext) as [string, DynamicContextItem][]));
+      if (storedDynamicContext) setDynamicContextMemory(reviveDynamicContextMemory(JSON.parse(storedDynamicContext) as [string, DynamicContextItem][]));
       
       const storedPMTs = localStorage.getItem(POTENTIAL_MAIN_TASKS_STORAGE_KEY);
-      if (storedPMTs) setPotentialMainTasks(JSON.parse(storedPMTs) as PotentialMainTask[]);
+      if (storedPMTs) setPotentialMainTasks(revivePotentialMainTasks(JSON.parse(storedPMTs) as PotentialMainTask[]));
 
     } catch (e) {
       logger.error(APP_COMPONENT_NAME, "useEffect[]", "Failed to load data from localStorage", e);
@@ -119,12 +209,12 @@ const App: React.FC = () => {
     }
   }, []);
 
-  useEffect(() => { try { localStorage.setItem(TASKS_STORAGE_KEY, JSON.stringify(tasks)); } catch (e) { logger.error(APP_COMPONENT_NAME, "useEffect[tasks]", "Failed to save tasks", e); }}, [tasks]);
-  useEffect(() => { try { localStorage.setItem(CONTEXTS_STORAGE_KEY, JSON.stringify(Array.from(allContexts.entries()))); } catch (e) { logger.error(APP_COMPONENT_NAME, "useEffect[allContexts]", "Failed to save contexts", e); }}, [allContexts]);
-  useEffect(() => { try { localStorage.setItem(SETTINGS_STORAGE_KEY, JSON.stringify(settings)); } catch (e) { logger.error(APP_COMPONENT_NAME, "useEffect[settings]", "Failed to save settings", e); }}, [settings]);
-  useEffect(() => { try { localStorage.setItem(LLM_CONFIG_STORAGE_KEY, JSON.stringify(externalLLMConfigs)); } catch (e) { logger.error(APP_COMPONENT_NAME, "useEffect[llmConfigs]", "Failed to save LLM configs", e); }}, [externalLLMConfigs]);
-  useEffect(() => { try { localStorage.setItem(DYNAMIC_CONTEXT_MEMORY_STORAGE_KEY, JSON.stringify(Array.from(dynamicContextMemory.entries()))); } catch (e) { logger.error(APP_COMPONENT_NAME, "useEffect[dynamicContext]", "Failed to save dynamic context", e); }}, [dynamicContextMemory]);
-  useEffect(() => { try { localStorage.setItem(POTENTIAL_MAIN_TASKS_STORAGE_KEY, JSON.stringify(potentialMainTasks)); } catch (e) { logger.error(APP_COMPONENT_NAME, "useEffect[pmts]", "Failed to save PMTs", e); }}, [potentialMainTasks]);
+  useDebouncedPersistence(TASKS_STORAGE_KEY, tasks, JSON.stringify, "tasks");
+  useDebouncedPersistence(CONTEXTS_STORAGE_KEY, allContexts, serializeMapEntries, "contexts");
+  useDebouncedPersistence(SETTINGS_STORAGE_KEY, settings, JSON.stringify, "settings");
+  useDebouncedPersistence(LLM_CONFIG_STORAGE_KEY, externalLLMConfigs, JSON.stringify, "LLM configs");
+  useDebouncedPersistence(DYNAMIC_CONTEXT_MEMORY_STORAGE_KEY, dynamicContextMemory, serializeMapEntries, "dynamic context");
+  useDebouncedPersistence(POTENTIAL_MAIN_TASKS_STORAGE_KEY, potentialMainTasks, serializeWithSets, "PMTs");
 
   useEffect(() => {
     const currentVideoElement = videoRef.current;
@@ -134,41 +224,44 @@ const App: React.FC = () => {
       videoRef.current.playsInline = true;
     }
     return () => {
+      // stopMonitoring already stops the stream's tracks and detaches it from the video element
       stopMonitoring(false, "Component unmounting");
-      // Use videoRef.current directly in cleanup if it might have changed or for consistency
       const videoToClean = videoRef.current; 
       if (videoToClean) {
         videoToClean.onloadedmetadata = null;
         videoToClean.onerror = null;
-        if (videoToClean.srcObject) {
-            (videoToClean.srcObject as MediaStream).getTracks().forEach((track: MediaStreamTrack) => track.stop());
-            videoToClean.srcObject = null;
-        }
       }
     };
   // eslint-disable-next-line react-hooks/exhaustive-deps
   }, []);
 
-  // Context Cleanup Effect
+  // Context Cleanup Effect. Reads the latest references through a ref, so the interval is created once
+  const contextReferencesRef = useRef({ tasks, suggestionContextId, potentialMainTasks, dynamicContextMemory });
+  useEffect(() => {
+    contextReferencesRef.current = { tasks, suggestionContextId, potentialMainTasks, dynamicContextMemory };
+  }, [tasks, suggestionContextId, potentialMainTasks, dynamicContextMemory]);
+
   useEffect(() => {
     const cleanupInterval = setInterval(() => {
+      const references = contextReferencesRef.current;
       setAllContexts((prevContexts: Map<string, CognitiveParserOutput>) => {
+        if (prevContexts.size === 0) return prevContexts; // Nothing to prune, skip walking tasks/PMTs/DCM
         const newContexts = new Map(prevContexts);
         let changed = false;
         const referencedContextIds = new Set<string>();
 
-        tasks.forEach((task: TaskItem) => {
+        references.tasks.forEach((task: TaskItem) => {
           referencedContextIds.add(task.firstSeenContextId);
           referencedContextIds.add(task.latestContextId);
         });
-        if (suggestionContextId) {
-          referencedContextIds.add(suggestionContextId);
+        if (references.suggestionContextId) {
+          referencedContextIds.add(references.suggestionContextId);
         }
-        potentialMainTasks.forEach((pmt: PotentialMainTask) => {
-          pmt.contributingContextIds?.forEach((id: string) => referencedContextIds.add(id));
+        references.potentialMainTasks.forEach((pmt: PotentialMainTask) => {
+          if (pmt.contributingContextIds instanceof Set) pmt.contributingContextIds.forEach((id: string) => referencedContextIds.add(id));
         });
-        dynamicContextMemory.forEach((dci: DynamicContextItem) => {
-            dci.sourceContextIds?.forEach((id: string) => referencedContextIds.add(id));
+        references.dynamicContextMemory.forEach((dci: DynamicContextItem) => {
+            if (dci.sourceContextIds instanceof Set) dci.sourceContextIds.forEach((id: string) => referencedContextIds.add(id));
         });
 
 
@@ -187,9 +280,19 @@ const App: React.FC = () => {
     }, 5 * 60 * 1000); // Run every 5 minutes
 
     return () => clearInterval(cleanupInterval);
-  }, [tasks, suggestionContextId, potentialMainTasks, dynamicContextMemory]);
+  }, []);
 
 
+  // Report pause/resume when page visibility changes
+  useEffect(() => {
+    if (!isMonitoring) return;
+    const handleVisibilityChange = () => {
+      setStatusMessage(document.hidden ? `Monitoring ${captureMode} paused (page hidden).` : `Monitoring ${captureMode}...`);
+    };
+    document.addEventListener('visibilitychange', handleVisibilityChange);
+    return () => document.removeEventListener('visibilitychange', handleVisibilityChange);
+  }, [isMonitoring, captureMode]);
+
   const applyTaskTrimming = useCallback((tasksToTrim: TaskItem[]): TaskItem[] => {
     if (tasksToTrim.length > settings.maxTaskListSize) {
       const sortedTasks = [...tasksToTrim].sort((a, b) => a.firstSeenTimestamp - b.firstSeenTimestamp);
@@ -234,7 +337,7 @@ const App: React.FC = () => {
     const video = videoRef.current;
     if (video.readyState < video.HAVE_CURRENT_DATA || video.videoWidth === 0 || video.videoHeight === 0) {
         setStatusMessage(`Preparing ${captureMode} capture...`);
-        await new Promise(resolve => setTimeout(resolve, 300));
+        await waitForVideoFrame(video, VIDEO_READY_TIMEOUT_MS);
         if (!mediaStreamRef.current || !mediaStreamRef.current.active || video.readyState < video.HAVE_CURRENT_DATA || video.videoWidth === 0 || video.videoHeight === 0) {
              setStatusMessage(`Capture from ${captureMode} skipped (video not ready).`);
              setIsCapturingFrame(false); setIsProcessing(false);
@@ -244,15 +347,21 @@ const App: React.FC = () => {
     }
 
     try {
-      const canvas = document.createElement('canvas');
-      canvas.width = video.videoWidth; canvas.height = video.videoHeight;
+      if (!captureCanvasRef.current) captureCanvasRef.current = document.createElement('canvas');
+      const canvas = captureCanvasRef.current;
+      // Only resize when the video dimensions change
+      if (canvas.width !== video.videoWidth) canvas.width = video.videoWidth;
+      if (canvas.height !== video.videoHeight) canvas.height = video.videoHeight;
       if (canvas.width === 0 || canvas.height === 0) throw new Error(`Canvas dimensions are zero. Video: ${video.videoWidth}x${video.videoHeight}, readyState: ${video.readyState}.`);
       const ctx = canvas.getContext('2d');
       if (!ctx) throw new Error("Could not get 2D context.");
       ctx.drawImage(video, 0, 0, canvas.width, canvas.height);
       
-      const imageDataUrl = canvas.toDataURL('image/png');
-      setLatestPreview(imageDataUrl);
+      const imageBlob = await new Promise<Blob | null>(resolve => canvas.toBlob(resolve, 'image/png'));
+      if (!imageBlob) throw new Error("Failed to encode captured frame.");
+      // The preview uses the blob; Gemini needs base64
+      setLatestPreview(URL.createObjectURL(imageBlob));
+      const imageDataUrl = await readBlobAsDataUrl(imageBlob);
       const base64ImageData = imageDataUrl.split(',')[1];
       if (!base64ImageData) throw new Error("Failed to extract base64 data from image.");
       
@@ -268,9 +377,10 @@ const App: React.FC = () => {
       setPotentialMainTasks(updatedPMTs);
       const topPMT = dynamicContextManager.getHighestWeightedPMTs(updatedPMTs, 1)[0] || null;
 
-      if (parsedContext.activeInteractionContext || parsedContext.inferredActivity) {
+      // Suggestions and the chronographer both only need the parsed context
+      const suggestionsPromise = (async () => {
+        if (!parsedContext.activeInteractionContext && !parsedContext.inferredActivity) { setContextualSuggestions([]); setSuggestionContextId(null); return; }
         setIsGeneratingSuggestions(true);
-        setStatusMessage("Generating contextual suggestions...");
         try {
           const suggestions = await generateContextualSuggestions(apexDoctrineContent, updatedMemory, topPMT, parsedContext.activeInteractionContext, parsedContext.inferredActivity, currentDirective);
           
@@ -280,10 +390,13 @@ const App: React.FC = () => {
           setError(`Suggestion Error: ${suggestionErr.message.substring(0,100)}...`); setFullErrorDetails(suggestionErr);
           setContextualSuggestions([]); setSuggestionContextId(null);
         } finally { setIsGeneratingSuggestions(false); }
-      } else { setContextualSuggestions([]); setSuggestionContextId(null); }
+      })();
 
-      setStatusMessage("Task Chronographer updating tasks...");
-      const updatedTasksFromLLM = await updateTasksWithChronographer(tasks, parsedContext, apexDoctrineContent, updatedMemory, topPMT, extractedKeywords, null, currentDirective);
+      setStatusMessage("Generating suggestions and updating tasks...");
+      const [, updatedTasksFromLLM] = await Promise.all([
+        suggestionsPromise,
+        updateTasksWithChronographer(tasks, parsedContext, apexDoctrineContent, updatedMemory, topPMT, extractedKeywords, null, currentDirective),
+      ]);
       
       const trimmedTasks = applyTaskTrimming(updatedTasksFromLLM.result);
       setTasks(trimmedTasks);
@@ -326,11 +439,11 @@ const App: React.FC = () => {
       });
       setIsMonitoring(true); setStatusMessage(`Monitoring ${captureMode}. Initial capture...`);
       setIsProcessing(false); 
-      await processCapture(true); 
+      // Initial capture runs in the background; the interval skips ticks while it is still running
+      void processCapture(true);
       if (captureIntervalIdRef.current) clearInterval(captureIntervalIdRef.current);
       captureIntervalIdRef.current = setInterval(() => {
         if (isMonitoringRef.current && !isProcessingAnyRef.current && !document.hidden) processCapture();
-        else if (document.hidden && isMonitoringRef.current) setStatusMessage(`Monitoring ${captureMode} paused (page hidden).`);
       }, settings.captureIntervalSeconds * 1000) as unknown as number;
       logger.info(APP_COMPONENT_NAME, "startMonitoring", `Monitoring started for ${captureMode}.`);
     } catch (err: any) {
@@ -344,6 +457,14 @@ const App: React.FC = () => {
     }
   }, [processCapture, settings.captureIntervalSeconds, stopMonitoring, captureMode]);
 
+  // Set when a settings change needs monitoring restarted; the effect restarts it once the stop has committed
+  const pendingMonitoringRestartRef = useRef(false);
+  useEffect(() => {
+    if (!pendingMonitoringRestartRef.current || isMonitoring) return;
+    pendingMonitoringRestartRef.current = false;
+    void startMonitoring();
+  }, [isMonitoring, startMonitoring]);
+
   const handleManualCapture = useCallback(() => {
     logger.debug(APP_COMPONENT_NAME, "handleManualCapture", "Manual capture initiated by user.");
     processCapture(true);
@@ -355,9 +476,8 @@ const App: React.FC = () => {
     setSettings((prevSettings: AppSettings) => ({...prevSettings, ...newSettings})); 
     if (isMonitoring && newSettings.captureIntervalSeconds !== oldInterval) {
       logger.info(APP_COMPONENT_NAME, "handleSaveAppSettings", `Capture interval changed from ${oldInterval}s to ${newSettings.captureIntervalSeconds}s. Restarting monitoring.`);
+      pendingMonitoringRestartRef.current = true;
       stopMonitoring(false, "Interval changed, restarting...");
-      // Set a short timeout to allow stopMonitoring to fully complete before starting
-      setTimeout(() => startMonitoring(), 100); 
     }
   };
   const handleSaveLLMConfigs = (newConfigs: ExternalLLMConfig[]) => { setExternalLLMConfigs(newConfigs); };
@@ -453,13 +573,8 @@ const App: React.FC = () => {
       }
       
        const responseData = await response.json();
-       let taskDataToParse: any;
-       // Adapt response parsing based on common LLM API structures
-       if (responseData.text && typeof responseData.text === 'string') taskDataToParse = responseData.text; // Simple text response
-       else if (responseData.choices && Array.isArray(responseData.choices) && responseData.choices[0]?.message?.content) taskDataToParse = responseData.choices[0].message.content; // OpenAI like
-       else if (responseData.candidates && Array.isArray(responseData.candidates) && responseData.candidates[0]?.content?.parts?.[0]?.text) taskDataToParse = responseData.candidates[0].content.parts[0].text; // Gemini like
-       else if (Array.isArray(responseData)) taskDataToParse = responseData; // Direct array response
-       else throw new Error("Could not find task list in LLM response. Unexpected format.");
+       const taskDataToParse = extractExternalLLMPayload(responseData);
+       if (!taskDataToParse) throw new Error("Could not find task list in LLM response. Unexpected format.");
 
        let parsedTasks: Array<{description: string; name?: string}>;
        if (typeof taskDataToParse === 'string') {
@@ -483,12 +598,14 @@ const App: React.FC = () => {
 
 
        const now = Date.now();
+       // All tasks from one planning response share a single synthetic context id; it only marks their origin
+       const planningContextId = `external-llm-${uuidv4()}`;
        const newGoalTasks: TaskItem[] = parsedTasks.map(pt => ({
          id: uuidv4(), 
          description: pt.name || pt.description, 
          status: 'To-Do',
-         firstSeenContextId: `external-llm-${uuidv4()}`, 
-         latestContextId: `external-llm-${uuidv4()}`,    
+         firstSeenContextId: planningContextId, 
+         latestContextId: planningContextId,    
          firstSeenTimestamp: now, 
          lastUpdatedTimestamp: now,
          historySnapshots: [`Task planned for goal: ${goal.substring(0,50)}... (via Ext. LLM: ${config.name.substring(0,20)})`],
@@ -532,13 +649,13 @@ const App: React.FC = () => {
       aggregatedFeedback: [], 
     };
     try {
-      const jsonString = `data:text/json;charset=utf-8,${encodeURIComponent(
-        JSON.stringify(dataToExport, null, 2)
-      )}`;
+      const exportBlob = new Blob([JSON.stringify(dataToExport, jsonReplacer, 2)], { type: 'application/json' });
+      const downloadUrl = URL.createObjectURL(exportBlob);
       const link = document.createElement("a");
-      link.href = jsonString;
+      link.href = downloadUrl;
       link.download = `contextualWeaverData_v1_${new Date().toISOString().split('T')[0]}.json`;
       link.click();
+      setTimeout(() => URL.revokeObjectURL(downloadUrl), EXPORT_URL_REVOKE_DELAY_MS); // Some browsers resolve the download asynchronously
       setStatusMessage("Data exported successfully.");
     } catch (e: any) {
       logger.error(APP_COMPONENT_NAME, "handleExportData", "Failed to export data", e);
@@ -578,10 +695,10 @@ const App: React.FC = () => {
           setExternalLLMConfigs(importedData.externalLLMConfigs as ExternalLLMConfig[]);
         }
         if (importedData.dynamicContextMemory && Array.isArray(importedData.dynamicContextMemory)) {
-          setDynamicContextMemory(new Map(importedData.dynamicContextMemory as Array<[string, DynamicContextItem]>));
+          setDynamicContextMemory(reviveDynamicContextMemory(importedData.dynamicContextMemory as Array<[string, DynamicContextItem]>));
         }
         if (importedData.potentialMainTasks && Array.isArray(importedData.potentialMainTasks)) {
-          setPotentialMainTasks(importedData.potentialMainTasks as PotentialMainTask[]);
+          setPotentialMainTasks(revivePotentialMainTasks(importedData.potentialMainTasks as PotentialMainTask[]));
         }
         // if (importedData.aggregatedFeedback && Array.isArray(importedData.aggregatedFeedback)) {
         //   setAggregatedFeedback(new Map(importedData.aggregatedFeedback));
@@ -610,27 +727,36 @@ const App: React.FC = () => {
     logger.info(APP_COMPONENT_NAME, "handleSetCurrentDirective", directive ? `Directive set: ${directive}` : "Directive cleared");
   }, []);
 
-  const filteredTasks = tasks.filter((task: TaskItem) => {
-    if (!taskSearchTerm.trim()) return true;
-    const searchTermLower = taskSearchTerm.toLowerCase();
-    return (
+  // Empty when there is no search term
+  const searchTermLower = taskSearchTerm.trim() ? taskSearchTerm.toLowerCase() : '';
+  // Tasks bucketed by status, filtered by the search term
+  const taskColumns = useMemo((): { title: string; status: TaskStatus; items: TaskItem[] }[] => {
+    const filteredTasks = !searchTermLower ? tasks : tasks.filter((task: TaskItem) => (
       task.description.toLowerCase().includes(searchTermLower) ||
       (task.notes && task.notes.toLowerCase().includes(searchTermLower)) ||
       (task.tags && task.tags.some((tag: string) => tag.toLowerCase().includes(searchTermLower))) ||
       (task.keywords && task.keywords.some((kw: string) => kw.toLowerCase().includes(searchTermLower)))
-    );
-  });
-
-  const taskColumns: { title: string; status: TaskStatus; items: TaskItem[] }[] = [
-    { title: "To-Do", status: "To-Do", items: filteredTasks.filter((t: TaskItem) => t.status === 'To-Do') },
-    { title: "Doing", status: "Doing", items: filteredTasks.filter((t: TaskItem) => t.status === 'Doing') },
-    { title: "Done", status: "Done", items: filteredTasks.filter((t: TaskItem) => t.status === 'Done') },
-  ];
+    ));
+    const itemsByStatus: Record<TaskStatus, TaskItem[]> = { 'To-Do': [], 'Doing': [], 'Done': [] };
+    filteredTasks.forEach((t: TaskItem) => itemsByStatus[t.status]?.push(t));
+    return [
+      { title: "To-Do", status: "To-Do", items: itemsByStatus['To-Do'] },
+      { title: "Doing", status: "Doing", items: itemsByStatus['Doing'] },
+      { title: "Done", status: "Done", items: itemsByStatus['Done'] },
+    ];
+  }, [tasks, searchTermLower]);
   
   const anyOperationPending = isProcessing || isCapturingFrame || isGeneratingSuggestions || isPlanningProject;
   const currentSuggestionContext = suggestionContextId ? allContexts.get(suggestionContextId) : undefined;
   const currentSuggestionFeedback = currentSuggestionContext?.suggestionsFeedback?.rating;
-  const topPMTForDisplay = dynamicContextManager.getHighestWeightedPMTs(potentialMainTasks, 1)[0];
+  // Top 5 PMTs for the header, debug panel and nudge modal
+  const topPMTs = useMemo(() => dynamicContextManager.getHighestWeightedPMTs(potentialMainTasks, 5), [potentialMainTasks]);
+  const topPMTForDisplay = topPMTs[0];
+  // Top 10 DCM keywords for the debug panel; empty while it is hidden
+  const topDCMItemsForDebug = useMemo(
+    () => settings.showDebugInfo ? dynamicContextManager.getHighestWeightedDCMItems(dynamicContextMemory, 10) : [],
+    [dynamicContextMemory, settings.showDebugInfo]
+  );
   
   let currentStatusMessage = statusMessage;
   if (isMonitoring && topPMTForDisplay && !anyOperationPending) {
@@ -715,10 +841,10 @@ const App: React.FC = () => {
               <div className="text-xs space-y-1 max-h-60 overflow-y-auto custom-scrollbar-xs">
                 <p className="font-semibold">Top PMT: {topPMTForDisplay?.description || 'N/A'} (W: {topPMTForDisplay?.weight.toFixed(2)})</p>
                 <p className="font-semibold">All PMTs ({potentialMainTasks.length}):</p>
-                {dynamicContextManager.getHighestWeightedPMTs(potentialMainTasks, 5).map(pmt => <p key={pmt.id}>- {pmt.description.substring(0,50)}... (W: {pmt.weight.toFixed(2)}, S: {pmt.source})</p>)}
+                {topPMTs.map(pmt => <p key={pmt.id}>- {pmt.description.substring(0,50)}... (W: {pmt.weight.toFixed(2)}, S: {pmt.source})</p>)}
                 <p className="font-semibold mt-1">Dynamic Context Memory ({dynamicContextMemory.size} items):</p>
-                {(Array.from(dynamicContextMemory.entries()) as Array<[string, DynamicContextItem]>).sort((a: [string, DynamicContextItem], b: [string, DynamicContextItem]) => b[1].weight - a[1].weight).slice(0,10).map(([key, item]: [string, DynamicContextItem]) => (
-                  <p key={key}>- {key} (W: {item.weight.toFixed(2)}, F: {item.frequency}, T: {new Date(item.lastSeenTimestamp).toLocaleTimeString()})</p>
+                {topDCMItemsForDebug.map((item: DynamicContextItem) => (
+                  <p key={item.keyword}>- {item.keyword} (W: {item.weight.toFixed(2)}, F: {item.frequency}, T: {new Date(item.lastSeenTimestamp).toLocaleTimeString()})</p>
                 ))}
               </div>
             </div>
@@ -764,7 +890,7 @@ const App: React.FC = () => {
         <NudgeModal
           isOpen={showNudgeModal}
           onClose={() => setShowNudgeModal(false)}
-          potentialMainTasks={dynamicContextManager.getHighestWeightedPMTs(potentialMainTasks, 3)}
+          potentialMainTasks={topPMTs.slice(0, 3)}
           onApplyNudge={handleApplyNudge}
         />
       )}
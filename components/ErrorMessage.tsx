@@ -9,6 +9,15 @@ interface ErrorMessageProps {
   detailsToCopy?: string | object; // Allow passing full error object or pre-formatted string
 }
 
+// Checked in order; the first rule matching the error message supplies the hint.
+const ERROR_GUIDANCE_RULES: Array<{ matches: (message: string) => boolean; hint: string }> = [
+  { matches: m => /api ?key/i.test(m), hint: "Hint: Please verify your API_KEY configuration or environment variable." },
+  { matches: m => /quota|rate limit|resource_exhausted/i.test(m), hint: "Hint: AI request limit reached. Please wait a few minutes or check your API plan." },
+  { matches: m => /media|camera|screen capture|getusermedia|getdisplaymedia/i.test(m), hint: "Hint: Ensure browser permissions are granted for camera/screen access for this site." },
+  { matches: m => /network|failed to fetch/i.test(m), hint: "Hint: Check your internet connection." },
+  { matches: m => /json/i.test(m) && /parse|output/i.test(m), hint: "Hint: AI returned an unexpected format. Retrying might help, or check the AI's prompt configuration if developing." },
+];
+
 export const ErrorMessage: React.FC<ErrorMessageProps> = ({ message, className = '', title = "Error", detailsToCopy }) => {
   const [copied, setCopied] = useState(false);
 
@@ -16,21 +25,7 @@ export const ErrorMessage: React.FC<ErrorMessageProps> = ({ message, className =
     return null;
   }
 
-  let userGuidance = "";
-  const lowerMessage = message.toLowerCase();
-
-  if (lowerMessage.includes("api key") || lowerMessage.includes("apikey")) {
-    userGuidance = "Hint: Please verify your API_KEY configuration or environment variable.";
-  } else if (lowerMessage.includes("quota") || lowerMessage.includes("rate limit") || lowerMessage.includes("resource_exhausted")) {
-    userGuidance = "Hint: AI request limit reached. Please wait a few minutes or check your API plan.";
-  } else if (lowerMessage.includes("media") || lowerMessage.includes("camera") || lowerMessage.includes("screen capture") || lowerMessage.includes("getusermedia") || lowerMessage.includes("getdisplaymedia")) {
-    userGuidance = "Hint: Ensure browser permissions are granted for camera/screen access for this site.";
-  } else if (lowerMessage.includes("network") || lowerMessage.includes("failed to fetch")) {
-    userGuidance = "Hint: Check your internet connection.";
-  } else if (lowerMessage.includes("json") && (lowerMessage.includes("parse") || lowerMessage.includes("output"))) {
-    userGuidance = "Hint: AI returned an unexpected format. Retrying might help, or check the AI's prompt configuration if developing."
-  }
-
+  const userGuidance = ERROR_GUIDANCE_RULES.find(rule => rule.matches(message))?.hint || "";
 
   const handleCopyError = () => {
     let textToCopy = `Error Title: ${title}\nError Message: ${message}\n`;
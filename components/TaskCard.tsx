@@ -51,7 +51,7 @@ const ContextDetailsDisplay: React.FC<{ context: CognitiveParserOutput | undefin
 };
 
 
-export const TaskCard: React.FC<TaskCardProps> = ({ task, allContexts, onUpdateTask, onRateTaskAccuracy }) => {
+const TaskCardComponent: React.FC<TaskCardProps> = ({ task, allContexts, onUpdateTask, onRateTaskAccuracy }) => {
   const [showDetails, setShowDetails] = useState(false);
   const [isEditingDescription, setIsEditingDescription] = useState(false);
   const [editingDesc, setEditingDesc] = useState(task.description);
@@ -91,6 +91,10 @@ export const TaskCard: React.FC<TaskCardProps> = ({ task, allContexts, onUpdateT
     return `${days}d ago`;
   };
 
+  const applyManualEdit = (updates: Partial<TaskItem>, editedField: UserEdit['editedField'], oldValue: UserEdit['oldValue'], newValue: UserEdit['newValue']) => {
+    onUpdateTask(task.id, updates, { timestamp: Date.now(), editedField, oldValue, newValue, editSource: 'user_manual' });
+  };
+
   const handleDescriptionSave = () => {
     if (editingDesc.trim() === '') {
         alert("Description cannot be empty.");
@@ -99,38 +103,22 @@ export const TaskCard: React.FC<TaskCardProps> = ({ task, allContexts, onUpdateT
         return;
     }
     if (editingDesc !== task.description) {
-        onUpdateTask(task.id, { description: editingDesc.trim() }, {
-            timestamp: Date.now(),
-            editedField: 'description',
-            oldValue: task.description,
-            newValue: editingDesc.trim(),
-            editSource: 'user_manual'
-        });
+        const trimmedDesc = editingDesc.trim();
+        applyManualEdit({ description: trimmedDesc }, 'description', task.description, trimmedDesc);
     }
     setIsEditingDescription(false);
   };
 
   const handleStatusChange = (newStatus: TaskStatus) => {
     if (newStatus !== task.status) {
-        onUpdateTask(task.id, { status: newStatus }, {
-            timestamp: Date.now(),
-            editedField: 'status',
-            oldValue: task.status,
-            newValue: newStatus,
-            editSource: 'user_manual'
-        });
+        applyManualEdit({ status: newStatus }, 'status', task.status, newStatus);
     }
   };
   
   const handleNotesSave = () => {
     if (editingNotes.trim() !== (task.notes || '').trim()) {
-        onUpdateTask(task.id, { notes: editingNotes.trim() }, {
-            timestamp: Date.now(),
-            editedField: 'notes',
-            oldValue: task.notes || '',
-            newValue: editingNotes.trim(),
-            editSource: 'user_manual'
-        });
+        const trimmedNotes = editingNotes.trim();
+        applyManualEdit({ notes: trimmedNotes }, 'notes', task.notes || '', trimmedNotes);
     }
     setIsEditingNotes(false);
   };
@@ -139,13 +127,7 @@ export const TaskCard: React.FC<TaskCardProps> = ({ task, allContexts, onUpdateT
     const trimmedTag = newTag.trim().toLowerCase();
     if (trimmedTag && !(task.tags || []).includes(trimmedTag)) {
       const updatedTags = [...(task.tags || []), trimmedTag];
-      onUpdateTask(task.id, { tags: updatedTags }, {
-        timestamp: Date.now(),
-        editedField: 'tags',
-        oldValue: task.tags,
-        newValue: updatedTags,
-        editSource: 'user_manual'
-      });
+      applyManualEdit({ tags: updatedTags }, 'tags', task.tags, updatedTags);
       setNewTag('');
     } else if (!trimmedTag) {
         alert("Tag cannot be empty.");
@@ -157,13 +139,7 @@ export const TaskCard: React.FC<TaskCardProps> = ({ task, allContexts, onUpdateT
 
   const handleRemoveTag = (tagToRemove: string) => {
     const updatedTags = (task.tags || []).filter(t => t !== tagToRemove);
-    onUpdateTask(task.id, { tags: updatedTags }, {
-        timestamp: Date.now(),
-        editedField: 'tags',
-        oldValue: task.tags,
-        newValue: updatedTags,
-        editSource: 'user_manual'
-      });
+    applyManualEdit({ tags: updatedTags }, 'tags', task.tags, updatedTags);
   };
 
   const handleFeedback = (rating: 'relevant' | 'irrelevant') => {
@@ -394,3 +370,5 @@ export const TaskCard: React.FC<TaskCardProps> = ({ task, allContexts, onUpdateT
     </div>
   );
 };
+
+export const TaskCard = React.memo(TaskCardComponent);
@@ -1,5 +1,5 @@
 
-import React from 'react';
+import React, { useMemo } from 'react';
 import type { TaskItem, CognitiveParserOutput, UserEdit } from '../types';
 import { TaskCard } from './TaskCard';
 
@@ -11,7 +11,13 @@ interface TaskColumnProps {
   onRateTaskAccuracy: (taskId: string, rating: 'relevant' | 'irrelevant') => void;
 }
 
-export const TaskColumn: React.FC<TaskColumnProps> = ({ title, tasks, allContexts, onUpdateTask, onRateTaskAccuracy }) => {
+const TaskColumnComponent: React.FC<TaskColumnProps> = ({ title, tasks, allContexts, onUpdateTask, onRateTaskAccuracy }) => {
+  // Sort a copy: the tasks array is App's memoized column bucket and must not be reordered in place
+  const sortedTasks = useMemo(
+    () => [...tasks].sort((a, b) => b.lastUpdatedTimestamp - a.lastUpdatedTimestamp), // Show most recently updated first
+    [tasks]
+  );
+
   return (
     <div className="bg-slate-850 p-2 sm:p-3 rounded-lg shadow-lg flex flex-col h-[calc(100vh-22rem)] min-h-[280px] sm:min-h-[300px] md:max-h-[550px] lg:max-h-[600px]">
       <h2 className="text-lg sm:text-xl font-semibold text-sky-300 mb-3 sticky top-0 bg-slate-850 py-2 z-10 border-b border-slate-700 px-1">
@@ -23,9 +29,7 @@ export const TaskColumn: React.FC<TaskColumnProps> = ({ title, tasks, allContext
         </p>
       ) : (
         <div className="space-y-2 sm:space-y-3 overflow-y-auto custom-scrollbar flex-grow pr-1 pb-1">
-          {tasks
-            .sort((a, b) => b.lastUpdatedTimestamp - a.lastUpdatedTimestamp) // Show most recently updated first
-            .map(task => (
+          {sortedTasks.map(task => (
             <TaskCard 
                 key={task.id} 
                 task={task} 
@@ -39,3 +43,5 @@ export const TaskColumn: React.FC<TaskColumnProps> = ({ title, tasks, allContext
     </div>
   );
 };
+
+export const TaskColumn = React.memo(TaskColumnComponent);
@@ -4,11 +4,25 @@ import { logger } from './logger';
 const COMPONENT_NAME = "DocumentFetcher";
 const HARMONIA_DIGITALIS_URL = "https://raw.githubusercontent.com/mokafari/Harmonia-Digitalis/main/Harmonia_Digitalis_v5.md";
 
+// In-flight or completed request shared by all callers; cleared when a fetch fails
+let harmoniaDigitalisRequest: Promise<string | null> | null = null;
+
 /**
- * Fetches the Harmonia Digitalis document.
+ * Fetches the Harmonia Digitalis document. Concurrent and later calls reuse the same request;
+ * a failed fetch is not cached, so the next call retries.
  * @returns {Promise<string | null>} The content of the document as a string, or null if fetching fails.
  */
-export async function fetchHarmoniaDigitalisDocument(): Promise<string | null> {
+export function fetchHarmoniaDigitalisDocument(): Promise<string | null> {
+  if (!harmoniaDigitalisRequest) {
+    harmoniaDigitalisRequest = requestHarmoniaDigitalisDocument().then(content => {
+      if (content === null) harmoniaDigitalisRequest = null;
+      return content;
+    });
+  }
+  return harmoniaDigitalisRequest;
+}
+
+async function requestHarmoniaDigitalisDocument(): Promise<string | null> {
   logger.info(COMPONENT_NAME, "fetchHarmoniaDigitalisDocument", `Attempting to fetch Harmonia Digitalis from ${HARMONIA_DIGITALIS_URL}`);
   try {
     const response = await fetch(HARMONIA_DIGITALIS_URL, {
@@ -21,9 +21,28 @@ const KEYWORD_GOAL_BOOST = 0.3;
 const KEYWORD_ACTIVITY_BOOST = 0.15;
 const KEYWORD_KEYTEXT_BOOST = 0.1;
 const RELATED_TASK_SUGGESTION_COUNT = 3;
+// Most recent context ids kept per DCM keyword and PMT
+const MAX_CONTEXT_IDS_PER_ITEM = 20;
 
 const STOP_WORDS = new Set(['a', 'an', 'the', 'is', 'was', 'are', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'should', 'can', 'could', 'may', 'might', 'must', 'and', 'but', 'or', 'nor', 'for', 'so', 'yet', 'if', 'then', 'else', 'when', 'where', 'why', 'how', 'what', 'which', 'who', 'whom', 'whose', 'this', 'that', 'these', 'those', 'in', 'on', 'at', 'by', 'from', 'to', 'with', 'about', 'above', 'after', 'again', 'against', 'all', 'am', 'any', 'as', 'because', 'before', 'below', 'between', 'both', 'com', 'cannot', 'down', 'during', 'each', 'few', 'further', 'here', 'http', 'https', 'i', 'into', 'it', 'its', 'itself', 'just', 'like', 'me', 'more', 'most', 'my', 'myself', 'no', 'not', 'now', 'of', 'off', 'once', 'only', 'other', 'ought', 'our', 'ours', 'ourselves', 'out', 'over', 'own', 'same', 'she', "s", "t", 'some', 'such', 'than', 'their', 'theirs', 'them', 'themselves', 'then', 'there', 'therefore', 'they', 'through', 'too', 'under', 'until', 'up', 'very', 'we', 'were', 'www', 'you', 'your', 'yours', 'yourself', 'yourselves', 'user', 'using', 'screen', 'capture', 'image', 'window', 'title', 'text', 'button', 'label', 'element', 'type', 'file', 'document', 'page', 'untitled', 'new', 'app', 'click', 'select', 'open', 'close', 'save', 'edit', 'view', 'manage', 'list', 'item', 'items', 'data', 'field', 'value', 'main', 'menu', 'tab', 'section', 'option', 'setting', 'config', 'form', 'input', 'output', 'log', 'error', 'message', 'details', 'overview', 'summary', 'report', 'analysis', 'test', 'dev', 'build', 'run', 'start', 'stop', 'process', 'update', 'create', 'delete', 'remove', 'add', 'get', 'set', 'send', 'receive', 'request', 'response', 'api', 'key', 'url', 'link', 'content', 'context', 'task', 'tasks', 'project', 'goal', 'plan', 'step', 'action', 'activity', 'mode', 'status', 'current', 'previous', 'next', 'first', 'last', 'number', 'string', 'object', 'array', 'null', 'undefined', 'true', 'false', 'system', 'chrome', 'google', 'microsoft', 'word', 'excel', 'vscode', 'code', 'script', 'python', 'javascript', 'typescript', 'react', 'node']);
 
+// Used by extractKeywordsFromContext to pick out the main verb of an activity and the nouns that follow it
+const COMMON_ACTIVITY_VERBS = new Set(['editing', 'writing', 'reading', 'developing', 'debugging', 'testing', 'managing', 'planning', 'researching', 'browsing', 'searching', 'watching', 'learning', 'organizing', 'reviewing', 'creating', 'designing', 'building', 'coding', 'typing', 'navigating', 'communicating', 'discussing', 'presenting', 'analyzing', 'reporting', 'monitoring', 'configuring', 'installing', 'deploying', 'fixing', 'troubleshooting', 'refactoring', 'optimizing', 'querying', 'visualizing', 'modeling', 'simulating', 'calculating', 'generating', 'exporting', 'importing', 'uploading', 'downloading']);
+const NOUN_PRECEDING_PREPOSITIONS = new Set(['on', 'in', 'for', 'about', 'with', 'to', 'of']);
+
+// Sets iterate in insertion order: re-adding moves an id to the end, and the oldest ids are evicted from the front.
+// Items restored from storage may carry an array (or `{}`) instead of a Set, so the result is always a Set.
+function addRecentContextId(ids: Set<string> | string[] | undefined, id: string): Set<string> {
+    const recentIds = ids instanceof Set ? ids : new Set<string>(Array.isArray(ids) ? ids : []);
+    recentIds.delete(id);
+    recentIds.add(id);
+    for (const oldestId of recentIds) {
+        if (recentIds.size <= MAX_CONTEXT_IDS_PER_ITEM) break;
+        recentIds.delete(oldestId);
+    }
+    return recentIds;
+}
+
 function calculateDecayFactor(lastSeenTimestamp: number, halflife: number): number {
     const ageMs = Date.now() - lastSeenTimestamp;
     if (ageMs <= 0) return 1.0;
@@ -53,15 +72,13 @@ export function extractKeywordsFromContext(context: CognitiveParserOutput): stri
 
     const mainActivityText = context.activeInteractionContext?.userActivityGoal || context.inferredActivity;
     if (mainActivityText) {
-        const commonVerbs = ['editing', 'writing', 'reading', 'developing', 'debugging', 'testing', 'managing', 'planning', 'researching', 'browsing', 'searching', 'watching', 'learning', 'organizing', 'reviewing', 'creating', 'designing', 'building', 'coding', 'typing', 'navigating', 'communicating', 'discussing', 'presenting', 'analyzing', 'reporting', 'monitoring', 'configuring', 'installing', 'deploying', 'fixing', 'troubleshooting', 'refactoring', 'optimizing', 'querying', 'visualizing', 'modeling', 'simulating', 'calculating', 'generating', 'exporting', 'importing', 'uploading', 'downloading'];
         const words = mainActivityText.toLowerCase().split(/\s+/);
-        const verb = words.find(word => commonVerbs.includes(word.replace(/[^a-z]/gi, '')));
+        const verb = words.find(word => COMMON_ACTIVITY_VERBS.has(word.replace(/[^a-z]/gi, '')));
         if(verb) keywords.add(verb);
 
         // Try to extract nouns after common verbs or prepositions
-        const prepositions = ['on', 'in', 'for', 'about', 'with', 'to', 'of'];
         for(let i=0; i < words.length -1; i++){
-            if(commonVerbs.includes(words[i]) || prepositions.includes(words[i])){
+            if(COMMON_ACTIVITY_VERBS.has(words[i]) || NOUN_PRECEDING_PREPOSITIONS.has(words[i])){
                 const potentialNoun = words[i+1].replace(/[^a-z0-9-]/gi, ''); // Allow hyphens in nouns
                 if(potentialNoun.length > 2 && potentialNoun.length < 25 && !STOP_WORDS.has(potentialNoun) && isNaN(Number(potentialNoun))){
                     keywords.add(potentialNoun);
@@ -72,7 +89,8 @@ export function extractKeywordsFromContext(context: CognitiveParserOutput): stri
     
     // Extract specific file names or identifiers from longer strings
     const extractIdentifier = (text: string | undefined | null) => {
-        if (!text) return;
+        // Both patterns below need a '.', so skip the regex scans for the (common) dotless strings
+        if (!text || !text.includes('.')) return;
         // Regex for common file names (e.g., name.ext), URLs, or specific identifiers
         const fileRegex = /(\b[a-zA-Z0-9_-]+\.[a-zA-Z0-9]{2,5}\b)/g; // e.g. component.tsx, document.pdf
         const urlRegex = /\b(?:[a-zA-Z]+:\/\/)?(?:www\.)?([a-zA-Z0-9-]+(?:\.[a-zA-Z0-9-]+)+)(?:\/[^\s]*)?/g; // domain part
@@ -129,7 +147,6 @@ export function analyzeSequentialContextForMetaIntent(
         return analysisOutput;
     }
 
-    const allKeywordsAcrossSequence: string[] = [];
     const keywordFrequency = new Map<string, number>();
     const activeTextEntries: Array<string | null | undefined> = [];
     const sourceContextIds = recentContexts.map(ctx => ctx.id);
@@ -137,7 +154,6 @@ export function analyzeSequentialContextForMetaIntent(
     recentContexts.forEach(context => {
         const keywords = extractKeywordsFromContext(context);
         keywords.forEach(kw => {
-            allKeywordsAcrossSequence.push(kw);
             keywordFrequency.set(kw, (keywordFrequency.get(kw) || 0) + 1);
         });
         if(context.activeUserTextEntry && context.activeUserTextEntry.trim().length > 3) { // Consider non-empty, meaningful entries
@@ -145,8 +161,9 @@ export function analyzeSequentialContextForMetaIntent(
         }
     });
 
+    const minKeywordOccurrences = Math.max(1, Math.floor(recentContexts.length * 0.5)); // Appears in at least 50% of contexts (min 1)
     const frequentKeywords = Array.from(keywordFrequency.entries())
-        .filter(([, count]) => count >= Math.max(1, Math.floor(recentContexts.length * 0.5))) // Appears in at least 50% of contexts (min 1)
+        .filter(([, count]) => count >= minKeywordOccurrences)
         .sort(([, countA], [, countB]) => countB - countA)
         .map(([kw]) => kw);
 
@@ -204,19 +221,23 @@ export function updateDynamicContextMemory(
 
     const extractedKeywords = extractKeywordsFromContext(context);
 
+    const goalLower = context.activeInteractionContext?.userActivityGoal?.toLowerCase();
+    const activityLower = context.inferredActivity?.toLowerCase();
+    const keyTextsLower = context.keyTexts.map(kt => kt.text.toLowerCase());
+
     extractedKeywords.forEach(keyword => {
         const existingItem = newMemory.get(keyword);
         let newWeight = KEYWORD_INITIAL_WEIGHT;
-        if (context.activeInteractionContext?.userActivityGoal?.toLowerCase().includes(keyword)) newWeight += KEYWORD_GOAL_BOOST;
-        if (context.inferredActivity?.toLowerCase().includes(keyword)) newWeight += KEYWORD_ACTIVITY_BOOST;
-        if (context.keyTexts.some(kt => kt.text.toLowerCase().includes(keyword))) newWeight += KEYWORD_KEYTEXT_BOOST;
+        if (goalLower?.includes(keyword)) newWeight += KEYWORD_GOAL_BOOST;
+        if (activityLower?.includes(keyword)) newWeight += KEYWORD_ACTIVITY_BOOST;
+        if (keyTextsLower.some(text => text.includes(keyword))) newWeight += KEYWORD_KEYTEXT_BOOST;
 
 
         if (existingItem) {
             existingItem.weight = Math.min(1, existingItem.weight + newWeight * 0.5); // Reinforce, cap at 1
             existingItem.lastSeenTimestamp = now;
             existingItem.frequency += 1;
-            existingItem.sourceContextIds.add(context.id);
+            existingItem.sourceContextIds = addRecentContextId(existingItem.sourceContextIds, context.id);
         } else {
             newMemory.set(keyword, {
                 keyword,
@@ -229,22 +250,16 @@ export function updateDynamicContextMemory(
     });
 
     // Decay, prune by minimum weight
-    const memoryArray = Array.from(newMemory.values())
-        .map(item => {
-            // Don't decay items just updated in this cycle. Only decay if lastSeenTimestamp is older.
-            const decay = (item.lastSeenTimestamp === now && extractedKeywords.includes(item.keyword)) ? 1.0 : calculateDecayFactor(item.lastSeenTimestamp, KEYWORD_WEIGHT_DECAY_HALFLIFE_MS);
-            return {
-                ...item,
-                weight: item.weight * decay
-            };
-        })
-        .filter(item => item.weight >= MIN_KEYWORD_WEIGHT_TO_KEEP);
     // Removed: Pruning by MAX_KEYWORDS_IN_DCM. This constant is now for consumers.
     // The list is sorted when consumers (like getHighestWeightedDCMItems or display logic) fetch data.
-
-    // Rebuild map
+    const extractedKeywordSet = new Set(extractedKeywords);
     const finalMemory: DynamicContextMemory = new Map();
-    memoryArray.forEach(item => finalMemory.set(item.keyword, item));
+    for (const item of newMemory.values()) {
+        // Don't decay items just updated in this cycle. Only decay if lastSeenTimestamp is older.
+        const decay = (item.lastSeenTimestamp === now && extractedKeywordSet.has(item.keyword)) ? 1.0 : calculateDecayFactor(item.lastSeenTimestamp, KEYWORD_WEIGHT_DECAY_HALFLIFE_MS);
+        const weight = item.weight * decay;
+        if (weight >= MIN_KEYWORD_WEIGHT_TO_KEEP) finalMemory.set(item.keyword, { ...item, weight });
+    }
     
     logger.debug(COMPONENT_NAME, "updateDynamicContextMemory", `DCM updated. Size: ${finalMemory.size}. Extracted keywords: ${extractedKeywords.length}`, {keywords: extractedKeywords.slice(0,5)});
     return { updatedMemory: finalMemory, extractedKeywords };
@@ -320,6 +335,11 @@ export function updatePotentialMainTasks(
             let reinforcedExisting = false;
             const pmtDescriptionForComparison = relevantTextForPmt.toLowerCase();
 
+            // Use metaIntent keywords if available and relevant, otherwise use current context keywords
+            const comparisonKeywords = (metaIntent && metaIntent.confidence >= 0.4 && metaIntent.contributingKeywords.length > 0) 
+                ? new Set(metaIntent.contributingKeywords) 
+                : new Set(extractKeywordsFromContext(context));
+
             for (const pmt of updatedPmts) {
                 const pmtDescLower = pmt.description.toLowerCase();
                 let similarity = 0;
@@ -327,10 +347,6 @@ export function updatePotentialMainTasks(
                     similarity = 0.7; 
                 } else { 
                     const pmtKeywords = new Set(extractKeywordsFromContext({ inferredActivity: pmt.description, activeUserTextEntry: pmt.description } as CognitiveParserOutput));
-                    // Use metaIntent keywords if available and relevant, otherwise use current context keywords
-                    const comparisonKeywords = (metaIntent && metaIntent.confidence >= 0.4 && metaIntent.contributingKeywords.length > 0) 
-                        ? new Set(metaIntent.contributingKeywords) 
-                        : new Set(extractKeywordsFromContext(context));
                     
                     const intersection = new Set([...pmtKeywords].filter(x => comparisonKeywords.has(x)));
                     if (pmtKeywords.size > 0 && comparisonKeywords.size > 0) {
@@ -345,8 +361,8 @@ export function updatePotentialMainTasks(
                     }
                     pmt.weight = Math.min(1, pmt.weight + reinforcementFactor * (pmt.source === 'user_confirmed' || pmt.source === 'user_created' ? 0.5 : 1)); 
                     pmt.lastReinforcedTimestamp = now;
-                    pmt.contributingContextIds.add(context.id);
-                    if (metaIntent && metaIntent.sourceContextIds) metaIntent.sourceContextIds.forEach(id => pmt.contributingContextIds.add(id));
+                    pmt.contributingContextIds = addRecentContextId(pmt.contributingContextIds, context.id);
+                    if (metaIntent && metaIntent.sourceContextIds) metaIntent.sourceContextIds.forEach(id => { pmt.contributingContextIds = addRecentContextId(pmt.contributingContextIds, id); });
                     reinforcedExisting = true;
                     logger.debug(COMPONENT_NAME, "updatePotentialMainTasks", `Reinforced PMT '${pmt.description.substring(0,20)}...' (similarity: ${similarity.toFixed(2)}, meta-intent factor: ${metaIntent ? metaIntent.confidence.toFixed(2) : 'N/A'}). New weight: ${pmt.weight.toFixed(2)}`);
                 }
@@ -377,7 +393,7 @@ export function updatePotentialMainTasks(
                         lastReinforcedTimestamp: now,
                         contributingContextIds: new Set([context.id])
                     };
-                    if (metaIntent && metaIntent.sourceContextIds) metaIntent.sourceContextIds.forEach(id => newPmt.contributingContextIds.add(id));
+                    if (metaIntent && metaIntent.sourceContextIds) metaIntent.sourceContextIds.forEach(id => { newPmt.contributingContextIds = addRecentContextId(newPmt.contributingContextIds, id); });
                     updatedPmts.push(newPmt);
                 }
             }
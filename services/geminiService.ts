@@ -12,6 +12,24 @@ if (!API_KEY) {
 
 const ai = new GoogleGenAI({ apiKey: API_KEY! });
 const TEXT_MODEL_NAME = 'gemini-2.5-flash-preview-04-17';
+const JSON_FENCE_REGEX = /^```(?:json)?\s*\n?(.*?)\n?\s*```$/s;
+// Error classifiers shared by the AI call sites
+const AI_QUOTA_ERROR_REGEX = /quota|rate limit|RESOURCE_EXHAUSTED/;
+const AI_JSON_ERROR_REGEX = /json|unexpected token|property name/i;
+
+// Turns a failed Gemini call into a user-facing message; `stage` names the pipeline step that failed.
+function describeAiError(error: any, stage: string, fallbackMessage: string): string {
+  if (AI_QUOTA_ERROR_REGEX.test(error.toString())) return `AI request failed (${stage}) due to rate limits or quota. Please try again later.`;
+  if (error.message && AI_JSON_ERROR_REGEX.test(error.message)) return `AI (${stage}) produced invalid JSON output. Retrying might help.`;
+  return error.message ? `${fallbackMessage} Details: ${error.message}` : fallbackMessage;
+}
+
+// Models occasionally wrap JSON output in a markdown code fence despite responseMimeType.
+function stripJsonFences(responseText: string | undefined): string {
+  const trimmed = responseText ? responseText.trim() : "";
+  const match = trimmed.match(JSON_FENCE_REGEX);
+  return match && match[1] ? match[1].trim() : trimmed;
+}
 
 const COGNITIVE_PARSER_PROMPT_TEMPLATE = (captureMode: CaptureMode, currentDirective: string | null) => `
 CRITICAL INSTRUCTION: Your entire response MUST BE a single, valid JSON object. Adhere EXACTLY to the schema defined below.
@@ -69,6 +87,26 @@ Generate a new UUID for the 'id' field for each call. Use the current epoch mill
 FINAL REMINDER: Your entire response MUST BE ONLY the JSON object specified above. No extra text. Ensure all JSON syntax is correct, especially for strings, commas, and brackets/braces.
 `;
 
+// Last parser prompt built, with the inputs it was built from
+let cachedParserSystemPrompt: { captureMode: CaptureMode; currentDirective: string | null; apexDoctrineContent: string | null; prompt: string } | null = null;
+
+function getCognitiveParserSystemPrompt(captureMode: CaptureMode, currentDirective: string | null, apexDoctrineContent: string | null): string {
+  if (cachedParserSystemPrompt &&
+      cachedParserSystemPrompt.captureMode === captureMode &&
+      cachedParserSystemPrompt.currentDirective === currentDirective &&
+      cachedParserSystemPrompt.apexDoctrineContent === apexDoctrineContent) {
+    return cachedParserSystemPrompt.prompt;
+  }
+  let systemPrompt = COGNITIVE_PARSER_PROMPT_TEMPLATE(captureMode, currentDirective);
+  if (apexDoctrineContent) {
+    systemPrompt = `<apex_doctrine source="AI Agent Apex Doctrine (AAD) - v5.0">\\n${apexDoctrineContent}\\n</apex_doctrine>\\n\\n${systemPrompt}\\nCRITICAL REMINDER: Your analysis, interpretations, and generated JSON output MUST strictly adhere to and align with the principles outlined in the <apex_doctrine> section above.`;
+  }
+  cachedParserSystemPrompt = { captureMode, currentDirective, apexDoctrineContent, prompt: systemPrompt };
+  return systemPrompt;
+}
+
+const COGNITIVE_PARSER_TEXT_PART = { text: "Describe the provided image according to the JSON schema in the system instructions. Output only the JSON object." };
+
 export async function cognitiveParseScreenImage(
   base64ImageData: string,
   apexDoctrineContent: string | null,
@@ -79,21 +117,15 @@ export async function cognitiveParseScreenImage(
     logger.error(COMPONENT_NAME, "cognitiveParseScreenImage", "Gemini API Key is not configured.");
     throw new Error("Gemini API Key is not configured.");
   }
-  const startTime = Date.now();
+  const startTime = performance.now();
   const imagePart = { inlineData: { mimeType: 'image/png', data: base64ImageData } };
-  let systemPrompt = COGNITIVE_PARSER_PROMPT_TEMPLATE(captureMode, currentDirective);
-  
-  if (apexDoctrineContent) {
-    systemPrompt = `<apex_doctrine source="AI Agent Apex Doctrine (AAD) - v5.0">\\n${apexDoctrineContent}\\n</apex_doctrine>\\n\\n${systemPrompt}\\nCRITICAL REMINDER: Your analysis, interpretations, and generated JSON output MUST strictly adhere to and align with the principles outlined in the <apex_doctrine> section above.`;
-  }
-  
-  const textPart = { text: "Describe the provided image according to the JSON schema in the system instructions. Output only the JSON object." };
+  const systemPrompt = getCognitiveParserSystemPrompt(captureMode, currentDirective, apexDoctrineContent);
   let jsonStr = ""; 
 
   try {
     const response: GenerateContentResponse = await ai.models.generateContent({
       model: TEXT_MODEL_NAME,
-      contents: { parts: [imagePart, textPart] },
+      contents: { parts: [imagePart, COGNITIVE_PARSER_TEXT_PART] },
       config: {
         systemInstruction: systemPrompt,
         responseMimeType: "application/json",
@@ -101,15 +133,10 @@ export async function cognitiveParseScreenImage(
       }
     });
 
-    jsonStr = response.text ? response.text.trim() : "";
-    const fenceRegex = /^```(?:json)?\\s*\\n?(.*?)\\n?\\s*```$/s;
-    const match = jsonStr.match(fenceRegex);
-    if (match && match[1]) {
-      jsonStr = match[1].trim();
-    }
+    jsonStr = stripJsonFences(response.text);
     
     const parsedOutput = JSON.parse(jsonStr) as Partial<CognitiveParserOutput>;
-    const durationMs = Date.now() - startTime;
+    const durationMs = Math.round(performance.now() - startTime);
 
     if (!parsedOutput.id) parsedOutput.id = uuidv4();
     if (!parsedOutput.timestamp) parsedOutput.timestamp = Date.now();
@@ -126,17 +153,29 @@ export async function cognitiveParseScreenImage(
     const problematicJsonSnippet = jsonStr ? jsonStr.substring(0, 500) : "N/A (jsonStr not populated before error or empty)";
     logger.error(COMPONENT_NAME, "cognitiveParseScreenImage", `Error parsing screen image with Gemini. Problematic JSON string (first 500 chars): '${problematicJsonSnippet}'`, error);
     
-    let errorMessage = "Failed to parse screen context with AI.";
-    if (error.message) errorMessage += ` Details: ${error.message}`;
-    if (error.toString().includes("quota") || error.toString().includes("rate limit") || error.toString().includes("RESOURCE_EXHAUSTED")) {
-        errorMessage = "AI request failed (Cognitive Parser) due to rate limits or quota. Please try again later.";
-    } else if (error.message && (error.message.toLowerCase().includes("json") || error.message.toLowerCase().includes("unexpected token") || error.message.toLowerCase().includes("property name"))) {
-        errorMessage = "AI (Cognitive Parser) produced invalid JSON output. Retrying might help.";
-    }
-    throw new Error(errorMessage);
+    throw new Error(describeAiError(error, "Cognitive Parser", "Failed to parse screen context with AI."));
   }
 }
 
+// User-state summary per memory snapshot, shared by the chronographer and suggestion prompts
+const dynamicContextSummaryCache = new WeakMap<DynamicContextMemory, string>();
+
+function summarizeDynamicContext(dynamicContext: DynamicContextMemory): string {
+  const cached = dynamicContextSummaryCache.get(dynamicContext);
+  if (cached !== undefined) return cached;
+  const summary = Array.from(dynamicContext.entries())
+    .sort(([,a],[,b]) => b.weight - a.weight)
+    .slice(0, 7)
+    .map(([kw, item]) => `${kw} (W: ${item.weight.toFixed(2)})`)
+    .join('; ') || "No strong dynamic context themes yet.";
+  dynamicContextSummaryCache.set(dynamicContext, summary);
+  return summary;
+}
+
+function describeMainTaskHypothesis(mainTaskHypothesis: PotentialMainTask | null): string {
+  return mainTaskHypothesis ? `${mainTaskHypothesis.description} (Confidence: ${mainTaskHypothesis.weight.toFixed(2)}, Source: ${mainTaskHypothesis.source})` : "Not yet determined.";
+}
+
 const TASK_CHRONOGRAPHER_PROMPT_TEMPLATE = (
     dynamicContextSummary: string, 
     mainTaskHypothesisText: string, 
@@ -193,6 +232,13 @@ Respond with ONLY the updated JSON list of tasks. Ensure valid JSON. All JSON ke
 If no changes are absolutely necessary based on the new context, return the original task list (or an empty array [] if no tasks existed).
 `;
 
+// Appends a snapshot unless it repeats the newest one; keeps the last 5
+function appendHistorySnapshot(historySnapshots: string[] | undefined, snapshot: string): string[] {
+  const history = historySnapshots || [];
+  if (history[history.length - 1] === snapshot) return history.slice(-5);
+  return [...history, snapshot].slice(-5);
+}
+
 export async function updateTasksWithChronographer(
   currentTasks: TaskItem[],
   newContext: CognitiveParserOutput,
@@ -207,7 +253,7 @@ export async function updateTasksWithChronographer(
     logger.error(COMPONENT_NAME, "updateTasksWithChronographer", "Gemini API Key is not configured.");
     return { result: currentTasks, durationMs: 0 }; 
   }
-  const startTime = Date.now();
+  const startTime = performance.now();
   
   const simplifiedTasksForPrompt = currentTasks.map(task => ({
     id: task.id,
@@ -218,13 +264,8 @@ export async function updateTasksWithChronographer(
     historySnapshots: task.historySnapshots?.slice(-2) || [] 
   }));
 
-  const dynamicContextSummary = Array.from(dynamicContext.entries())
-    .sort(([,a],[,b]) => b.weight - a.weight)
-    .slice(0, 7) 
-    .map(([kw, item]) => `${kw} (W: ${item.weight.toFixed(2)})`)
-    .join('; ') || "No strong dynamic context themes yet.";
-  
-  const mainTaskHypothesisText = mainTaskHypothesis ? `${mainTaskHypothesis.description} (Confidence: ${mainTaskHypothesis.weight.toFixed(2)}, Source: ${mainTaskHypothesis.source})` : "Not yet determined.";
+  const dynamicContextSummary = summarizeDynamicContext(dynamicContext);
+  const mainTaskHypothesisText = describeMainTaskHypothesis(mainTaskHypothesis);
 
   let systemInstruction = TASK_CHRONOGRAPHER_PROMPT_TEMPLATE(
     dynamicContextSummary, 
@@ -246,12 +287,12 @@ ${JSON.stringify({
     keyTexts: newContext.keyTexts.slice(0,3).map(kt=> ({text: kt.text, role: kt.role})), 
     uiElements: newContext.uiElements.slice(0,3).map(ui=>({type: ui.type, label: ui.label})), 
     activeInteractionContext: newContext.activeInteractionContext 
-}, null, 2)}
+})}
 
 Current Context Keywords (to be associated with new/updated tasks if relevant): ${JSON.stringify(currentKeywords)}
 
 Existing Tasks (summary):
-${JSON.stringify(simplifiedTasksForPrompt, null, 2)}
+${JSON.stringify(simplifiedTasksForPrompt)}
 
 Analyze and return the updated task list as JSON, following all rules from the system instruction.
 Important: For any new task you create, ensure its 'id' is a newly generated UUID and associate the 'Current Context Keywords' (provided above) with its 'keywords' field.
@@ -269,17 +310,13 @@ When updating a task, if you change its description or status, add an entry to i
       }
     });
     
-    jsonStrChronographer = response.text ? response.text.trim() : "";
-    const fenceRegex = /^```(?:json)?\\s*\\n?(.*?)\\n?\\s*```$/s;
-    const match = jsonStrChronographer.match(fenceRegex);
-    if (match && match[1]) {
-      jsonStrChronographer = match[1].trim();
-    }
+    jsonStrChronographer = stripJsonFences(response.text);
 
     const updatedTasksFromLLM = JSON.parse(jsonStrChronographer) as Partial<TaskItem>[];
     
+    const currentTasksById = new Map(currentTasks.map(task => [task.id, task]));
     const processedTasks = updatedTasksFromLLM.map(llmTask => {
-      let existingTask = currentTasks.find(t => t.id === llmTask.id);
+      let existingTask = llmTask.id ? currentTasksById.get(llmTask.id) : undefined;
       const now = Date.now();
       
       let finalKeywords = llmTask.keywords || []; 
@@ -313,7 +350,7 @@ When updating a task, if you change its description or status, add an entry to i
             latestContextId: newContext.id,
             historySnapshots: llmTask.historySnapshots ? 
                 [...(existingTask.historySnapshots || []).filter(s => !llmTask.historySnapshots?.includes(s)), ...llmTask.historySnapshots].slice(-5) : 
-                [...(existingTask.historySnapshots || []), `Context: ${newContext.inferredActivity.substring(0,30)}...`].slice(-5),
+                appendHistorySnapshot(existingTask.historySnapshots, `Context: ${newContext.inferredActivity.substring(0,30)}...`),
             userEditsHistory: [...(existingTask.userEditsHistory || []), ...aiEditHistory].filter(Boolean).slice(-10),
             confidence: llmTask.confidence !== undefined ? llmTask.confidence : existingTask.confidence,
             notes: llmTask.notes !== undefined ? llmTask.notes : existingTask.notes,
@@ -339,27 +376,23 @@ When updating a task, if you change its description or status, add an entry to i
           } as TaskItem; 
       }
     });
-    const durationMs = Date.now() - startTime;
+    const durationMs = Math.round(performance.now() - startTime);
     logger.debug(COMPONENT_NAME, "updateTasksWithChronographer", `Chronographer updated tasks in ${durationMs}ms. Output count: ${processedTasks.length}. Directive: ${currentDirective}`);
     return { result: processedTasks, durationMs };
 
   } catch (error: any) {
-    const durationMs = Date.now() - startTime;
+    const durationMs = Math.round(performance.now() - startTime);
     const problematicJsonSnippet = jsonStrChronographer ? jsonStrChronographer.substring(0, 500) : "N/A";
     logger.error(COMPONENT_NAME, "updateTasksWithChronographer", `Error. Problematic JSON: '${problematicJsonSnippet}'`, error);
-    let errorMessage = "Failed to update tasks with AI Chronographer.";
-    if (error.message) errorMessage += ` Details: ${error.message}`;
-     if (error.toString().includes("quota") || error.toString().includes("rate limit") || error.toString().includes("RESOURCE_EXHAUSTED")) {
-        errorMessage = "AI request failed (Chronographer) due to rate limits or quota.";
-    } else if (error.message && (error.message.toLowerCase().includes("json") || error.message.toLowerCase().includes("unexpected token") || error.message.toLowerCase().includes("property name"))) {
-        errorMessage = "AI (Chronographer) produced invalid JSON output.";
-    }
-    logger.warn(COMPONENT_NAME, "updateTasksWithChronographer", "Chronographer failed, returning original tasks with context update.");
+    const errorMessage = describeAiError(error, "Chronographer", "Failed to update tasks with AI Chronographer.");
+    logger.warn(COMPONENT_NAME, "updateTasksWithChronographer", `${errorMessage} Returning original tasks with context update.`);
     const now = Date.now();
     return { result: currentTasks.map(task => ({...task, latestContextId: newContext.id, lastUpdatedTimestamp: now })), durationMs}; 
   }
 }
 
+const SUGGESTION_REQUEST_CONTENTS = [{role: "user", parts: [{text: "Please provide suggestions based on the system instruction and the context provided."}]}];
+
 const SUGGESTION_GENERATOR_PROMPT_TEMPLATE = (
     dynamicContextSummary: string, 
     mainTaskHypothesisText: string,
@@ -403,17 +436,12 @@ export async function generateContextualSuggestions(
       return { result: [], durationMs: 0 };
   }
 
-  const startTime = Date.now();
+  const startTime = performance.now();
   const activity = activityDescription || "User activity context not specifically detailed.";
   const goal = interactionContext?.userActivityGoal || "User's immediate goal not explicitly stated.";
 
-  const dynamicContextSummary = Array.from(dynamicContext.entries())
-    .sort(([,a],[,b]) => b.weight - a.weight)
-    .slice(0, 7)
-    .map(([kw, item]) => `${kw} (W: ${item.weight.toFixed(2)})`)
-    .join('; ') || "No strong dynamic context themes yet.";
-  
-  const mainTaskHypothesisText = mainTaskHypothesis ? `${mainTaskHypothesis.description} (Confidence: ${mainTaskHypothesis.weight.toFixed(2)}, Source: ${mainTaskHypothesis.source})` : "Not yet determined.";
+  const dynamicContextSummary = summarizeDynamicContext(dynamicContext);
+  const mainTaskHypothesisText = describeMainTaskHypothesis(mainTaskHypothesis);
 
 
   let systemInstruction = SUGGESTION_GENERATOR_PROMPT_TEMPLATE(
@@ -432,31 +460,26 @@ export async function generateContextualSuggestions(
   try {
     const response: GenerateContentResponse = await ai.models.generateContent({
       model: TEXT_MODEL_NAME,
-      contents: [{role: "user", parts: [{text: "Please provide suggestions based on the system instruction and the context provided."}]}],
+      contents: SUGGESTION_REQUEST_CONTENTS,
       config: {
         systemInstruction: systemInstruction,
         responseMimeType: "application/json",
       }
     });
 
-    jsonStrSuggestions = response.text ? response.text.trim() : "";
-    const fenceRegex = /^```(?:json)?\\s*\\n?(.*?)\\n?\\s*```$/s;
-    const match = jsonStrSuggestions.match(fenceRegex);
-    if (match && match[1]) {
-      jsonStrSuggestions = match[1].trim();
-    }
+    jsonStrSuggestions = stripJsonFences(response.text);
     
     const suggestions = JSON.parse(jsonStrSuggestions) as string[];
     if (!Array.isArray(suggestions) || !suggestions.every(s => typeof s === 'string')) {
         logger.warn(COMPONENT_NAME, "generateContextualSuggestions", "Suggestions from AI were not an array of strings", suggestions);
-        return {result: [], durationMs: Date.now() - startTime};
+        return {result: [], durationMs: Math.round(performance.now() - startTime)};
     }
-    const durationMs = Date.now() - startTime;
+    const durationMs = Math.round(performance.now() - startTime);
     logger.debug(COMPONENT_NAME, "generateContextualSuggestions", `Successfully generated ${suggestions.length} suggestions in ${durationMs}ms. Directive: ${currentDirective}`, suggestions);
     return {result: suggestions.slice(0, 5), durationMs};
 
   } catch (error: any) {
-    const durationMs = Date.now() - startTime;
+    const durationMs = Math.round(performance.now() - startTime);
     const problematicJsonSnippet = jsonStrSuggestions ? jsonStrSuggestions.substring(0, 500) : "N/A";
     logger.error(COMPONENT_NAME, "generateContextualSuggestions", `Error generating suggestions. Problematic JSON: '${problematicJsonSnippet}'`, error);
     return {result: [], durationMs};
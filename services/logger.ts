@@ -10,28 +10,23 @@ enum LogLevel {
   DEBUG = "DEBUG"
 }
 
+// Console method per level, looked up on console at call time
+const CONSOLE_METHOD_BY_LEVEL: Record<LogLevel, 'log' | 'info' | 'warn' | 'error' | 'debug'> = {
+  [LogLevel.LOG]: 'log',
+  [LogLevel.INFO]: 'info',
+  [LogLevel.WARN]: 'warn',
+  [LogLevel.ERROR]: 'error',
+  [LogLevel.DEBUG]: 'debug',
+};
+
+// Debug output follows the "Show Debug Info" setting (App calls logger.setDebugEnabled).
+let debugLoggingEnabled = false;
+
 const log = (level: LogLevel, component: string, funcName: string, message: string, ...data: any[]) => {
   const timestamp = new Date().toISOString();
   const logMessage = `[${timestamp}] [${level}] [${component}${funcName ? `.${funcName}` : ''}]: ${message}`;
   
-  switch (level) {
-    case LogLevel.ERROR:
-      console.error(logMessage, ...data);
-      break;
-    case LogLevel.WARN:
-      console.warn(logMessage, ...data);
-      break;
-    case LogLevel.INFO:
-      console.info(logMessage, ...data);
-      break;
-    case LogLevel.DEBUG:
-      // For debug, only log if a specific flag is set (e.g., in localStorage or a global const)
-      // For now, let's use console.debug which might be filtered by browser devtools
-      console.debug(logMessage, ...data);
-      break;
-    default:
-      console.log(logMessage, ...data);
-  }
+  console[CONSOLE_METHOD_BY_LEVEL[level]](logMessage, ...data);
 };
 
 export const logger = {
@@ -48,6 +43,10 @@ export const logger = {
       log(LogLevel.ERROR, component, funcName, message, ...data);
     }
   },
-  debug: (component: string, funcName: string, message: string, ...data: any[]) =>
-    log(LogLevel.DEBUG, component, funcName, message, ...data),
+  debug: (component: string, funcName: string, message: string, ...data: any[]) => {
+    if (debugLoggingEnabled) log(LogLevel.DEBUG, component, funcName, message, ...data);
+  },
+  setDebugEnabled: (enabled: boolean) => {
+    debugLoggingEnabled = enabled;
+  },
 };